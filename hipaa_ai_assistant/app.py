@@ -1,10 +1,28 @@
 # app.py
+import asyncio
+import hashlib
+import itertools
+import os
+
 import streamlit as st
 import pandas as pd
 
 from hipaa_questions import questions_core, questions_full
-from risk_engine import generate_risk_report
-from pdf_export import build_hipaa_pdf
+from pipeline import run_report_pipeline
+from report_model import build_report_model
+from report_formats import RENDERERS
+from portfolio import append_assessment, load_portfolio
+from evidence import EvidenceStore
+from simulation import simulate_assessment
+from remediation import plan_remediation
+from whatif import WhatIfModel
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+PORTFOLIO_PATH = os.getenv("HIPAA_PORTFOLIO_PATH", os.path.join(APP_DIR, "portfolio.jsonl"))
+EVIDENCE_DIR = os.getenv("HIPAA_EVIDENCE_DIR", os.path.join(APP_DIR, "evidence_store"))
+# The app keeps one rolling assessment per org (as the portfolio does), so evidence
+# attached on any day stays with the org's report.
+EVIDENCE_ASSESSMENT_ID = "current"
 
 
 def safe_filename(text: str) -> str:
@@ -13,6 +31,44 @@ def safe_filename(text: str) -> str:
     return "".join(ch for ch in text if ch in allowed) or "organization"
 
 
+def org_key(org_name: str) -> str | None:
+    """
+    Portfolio and evidence id for an org: readable prefix plus a hash of the exact
+    name, so "Acme Inc" and "Acme, Inc" never share a row. None for a blank name.
+    """
+    name = (org_name or "").strip()
+    if not name:
+        return None
+    digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:12]
+    return f"{safe_filename(name)[:60]}-{digest}"
+
+
+@st.cache_resource
+def get_portfolio():
+    return load_portfolio(PORTFOLIO_PATH)
+
+
+@st.cache_resource
+def get_evidence_store():
+    return EvidenceStore(EVIDENCE_DIR)
+
+
+@st.cache_resource
+def get_whatif_model(mode: str):
+    return WhatIfModel(questions_core if mode.startswith("Basic") else questions_full)
+
+
+def whatif_caption(projection: dict, current: str) -> str:
+    parts = []
+    for answer, p in projection.items():
+        if answer == current:
+            continue
+        parts.append(f"If {answer}: {p['overall']}% ({p['overall_delta']:+.1f}), {p['risk_level']} risk")
+        if p["findings_delta"]:
+            parts[-1] += f", {p['findings_delta']:+d} finding"
+    return " · ".join(parts)
+
+
 def risk_badge(level: str) -> str:
     if level == "High":
         return "badge-high"
@@ -174,9 +230,43 @@ with left:
     assessment_mode = st.selectbox("Assessment Mode", ["Basic (Core 20)", "Advanced (Full Security Rule)"])
     selected_questions = questions_core if assessment_mode.startswith("Basic") else questions_full
     use_ai_polish = st.checkbox("Use AI to polish findings", value=True)
+    run_simulation = st.checkbox("Simulate uncertainty for Unsure answers (Monte Carlo)", value=False)
+    remediation_budget = st.number_input(
+        "Remediation effort budget (units: Unsure = 1, No = 3)", min_value=0, max_value=500, value=10
+    )
+
+    st.markdown('<div class="section-title">Evidence</div>', unsafe_allow_html=True)
+    evidence_store = get_evidence_store()
+    evidence_org = org_key(org_name)
+    attached = []
+    if evidence_org is None:
+        st.caption("Enter an organization name to attach evidence.")
+    else:
+        evidence_question = st.selectbox(
+            "Attach evidence to question",
+            [q["id"] for q in selected_questions],
+            format_func=lambda qid: f"{qid} - {next(q['question'] for q in selected_questions if q['id'] == qid)}"
+        )
+        uploads = st.file_uploader("Evidence files", accept_multiple_files=True, key=f"evidence_{evidence_question}")
+        # The uploader keeps its files across reruns; only hash each upload once per org/question.
+        processed = st.session_state.setdefault("evidence_processed", set())
+        for upload in uploads or []:
+            upload_key = (evidence_org, evidence_question, upload.file_id)
+            if upload_key in processed:
+                continue
+            upload.seek(0)
+            evidence_store.add_stream(evidence_org, EVIDENCE_ASSESSMENT_ID, evidence_question, upload, upload.name)
+            processed.add(upload_key)
+        attached = evidence_store.evidence_for(evidence_org, EVIDENCE_ASSESSMENT_ID)
+    if attached:
+        st.caption(", ".join(f"{ref['question_id']}: {ref['filename']}" for ref in attached))
 
 with right:
     st.markdown('<div class="section-title">Questionnaire</div>', unsafe_allow_html=True)
+    # Projected scores for every single-answer change, from the answers currently selected.
+    current_answers = {q["id"]: st.session_state.get(q["id"], "Yes") for q in selected_questions}
+    projections = get_whatif_model(assessment_mode).project(current_answers)
+
     responses = {}
     for q in selected_questions:
         responses[q["id"]] = st.selectbox(
@@ -184,21 +274,50 @@ with right:
             ["Yes", "No", "Unsure"],
             key=q["id"]
         )
+        st.caption(whatif_caption(projections[q["id"]], responses[q["id"]]))
 
 st.divider()
 
 if st.button("Generate Dashboard + Report"):
-    summary, findings, overall_level, score_breakdown = generate_risk_report(
-        org_context={
-            "organization": org_name,
-            "type": org_type,
-            "employees": employees,
-            "uses_msp": uses_msp,
-        },
-        questions=selected_questions,
-        responses=responses,
-        use_ai_polish=use_ai_polish
-    )
+    org_context = {
+        "organization": org_name,
+        "type": org_type,
+        "employees": employees,
+        "uses_msp": uses_msp,
+    }
+
+    # The rule-based draft PDF is offered as soon as it renders; each polished
+    # category re-renders it, and the slot clears once the final report is ready.
+    draft_slot = st.empty()
+    draft_ids = itertools.count(1)
+
+    def show_draft(report_bytes: bytes, final: bool):
+        if final:
+            draft_slot.empty()
+            return
+        draft_slot.download_button(
+            "Download draft PDF (AI polish in progress)",
+            report_bytes,
+            file_name=f"HIPAA_Self_Risk_Assessment_{safe_filename(org_name)}_draft.pdf",
+            mime="application/pdf",
+            key=f"draft_pdf_{next(draft_ids)}"
+        )
+
+    summary, findings, overall_level, score_breakdown, pdf_bytes = asyncio.run(run_report_pipeline(
+        org_context,
+        selected_questions,
+        responses,
+        use_ai_polish=use_ai_polish,
+        on_render=show_draft,
+        evidence=attached,
+    ))
+
+    portfolio_id = org_key(org_name)
+    if portfolio_id is not None:
+        append_assessment(PORTFOLIO_PATH, portfolio_id, {"type": org_type}, score_breakdown, findings)
+        get_portfolio().add_assessment(portfolio_id, {"type": org_type}, score_breakdown, findings)
+    else:
+        st.caption("Enter an organization name to include this assessment in portfolio analytics.")
 
     overall_score = score_breakdown.get("Overall", 0)
 
@@ -231,6 +350,28 @@ if st.button("Generate Dashboard + Report"):
 
     st.progress(int(overall_score))
 
+    if run_simulation:
+        sim = simulate_assessment(selected_questions, responses)
+        ci_pct = int(sim["ci"] * 100)
+        st.markdown('<div class="section-title">Uncertainty (Monte Carlo)</div>', unsafe_allow_html=True)
+        st.caption(
+            f"{sim['trials']:,} trials. Unsure answers sampled as Yes/No; likelihood and impact sampled around defaults. "
+            f"Most likely overall risk: {sim['overall_level']}."
+        )
+        sim_left, sim_right = st.columns([2, 1], gap="large")
+        with sim_left:
+            st.dataframe(
+                pd.DataFrame.from_dict(sim["compliance"], orient="index").rename(columns={
+                    "mean": "Mean %", "low": f"{ci_pct}% CI low", "high": f"{ci_pct}% CI high"
+                }),
+                use_container_width=True
+            )
+        with sim_right:
+            st.dataframe(
+                pd.DataFrame({"Probability": sim["risk_level_probs"]}),
+                use_container_width=True
+            )
+
     st.divider()
 
     st.markdown('<div class="section-title">Findings</div>', unsafe_allow_html=True)
@@ -246,16 +387,65 @@ if st.button("Generate Dashboard + Report"):
         st.write(f"**Recommendation:** {f['recommendation']}")
         st.write("---")
 
-    pdf_bytes = build_hipaa_pdf(
-        org_context={"organization": org_name},
+    if findings:
+        plan = plan_remediation(selected_questions, responses, int(remediation_budget))
+        st.markdown('<div class="section-title">Remediation Plan</div>', unsafe_allow_html=True)
+        st.caption(
+            f"{len(plan['selected'])} fixes using {plan['effort_used']} of {plan['budget']} effort units. "
+            f"Projected compliance {plan['projected_compliance']}% (now {overall_score}%), "
+            f"projected risk level {plan['projected_level']}."
+        )
+        if plan["selected"]:
+            st.dataframe(
+                pd.DataFrame(plan["selected"])[
+                    ["id", "title", "answer", "effort", "risk_reduction", "compliance_gain", "max_score_delta"]
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+
+    report_model = build_report_model(
+        org_context=org_context,
         summary=summary,
         overall_level=overall_level,
-        findings=findings
+        findings=findings,
+        score_breakdown=score_breakdown,
+        evidence=attached
     )
+    report_name = f"HIPAA_Self_Risk_Assessment_{safe_filename(org_name)}"
 
     st.download_button(
         "Download PDF Report",
         pdf_bytes,
-        file_name=f"HIPAA_Self_Risk_Assessment_{safe_filename(org_name)}.pdf",
+        file_name=f"{report_name}.pdf",
         mime="application/pdf"
-    )
\ No newline at end of file
+    )
+
+    export_cols = st.columns(len(RENDERERS))
+    for col, (fmt, (renderer, mime, ext)) in zip(export_cols, RENDERERS.items()):
+        with col:
+            st.download_button(
+                f"Download {fmt.upper()}",
+                renderer(report_model),
+                file_name=f"{report_name}.{ext}",
+                mime=mime,
+                key=f"download_{fmt}"
+            )
+
+portfolio = get_portfolio()
+if len(portfolio):
+    st.divider()
+    st.markdown('<div class="section-title">Portfolio Analytics</div>', unsafe_allow_html=True)
+    st.caption(f"{len(portfolio)} organizations assessed (latest assessment per organization)")
+
+    p_left, p_right = st.columns([1, 1], gap="large")
+    with p_left:
+        st.write("**Weakest category by organization type**")
+        st.dataframe(portfolio.weakest_category_by_org_type(), hide_index=True, use_container_width=True)
+        st.write("**Compliance percentiles across organizations**")
+        st.dataframe(portfolio.percentiles(), use_container_width=True)
+    with p_right:
+        st.write("**Most common High findings**")
+        st.dataframe(portfolio.most_common_findings("High"), hide_index=True, use_container_width=True)
+        st.write("**Mean compliance by organization type**")
+        st.dataframe(portfolio.category_means_by_org_type(), use_container_width=True)
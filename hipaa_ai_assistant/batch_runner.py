@@ -0,0 +1,248 @@
+# batch_runner.py
+# Resumable, checkpointed batch runs over many orgs.
+#
+# Input is a JSON-lines file, one org per line:
+#   {"org_id": "...", "org_context": {...}, "mode": "core"|"full", "responses": {...}}
+# Every finished or failed org is appended to <out>/journal.jsonl. On restart,
+# orgs whose latest journal entry is "done" are skipped and failures are retried.
+# Polished findings are checkpointed next to the PDF, so a crash after the LLM
+# call never pays for that call again. Polished output is merged onto the rule
+# findings and validated before it is checkpointed. The checkpoint carries a
+# digest of the job inputs and is ignored once they change. An org_id may
+# appear only once per jobs file; repeats are rejected.
+#
+# Usage: python batch_runner.py jobs.jsonl --out reports/ [--workers 4] [--no-polish]
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from hipaa_questions import questions_core, questions_full
+
+JOURNAL_NAME = "journal.jsonl"
+# Keys summarize_findings and the PDF need from every finding.
+REQUIRED_FINDING_KEYS = ("id", "title", "citation", "score", "risk_level", "observation", "recommendation")
+
+
+def _safe_name(text: str) -> str:
+    allowed = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-."
+    return "".join(ch for ch in str(text).replace(" ", "_") if ch in allowed) or "organization"
+
+
+def _file_key(org_id: str) -> str:
+    # Readable prefix plus a hash of the exact org_id, so "Acme Inc" and "Acme, Inc" never share files.
+    digest = hashlib.sha256(str(org_id).encode("utf-8")).hexdigest()[:12]
+    return f"{_safe_name(org_id)[:60]}-{digest}"
+
+
+def _inputs_digest(job: dict, use_ai_polish: bool) -> str:
+    payload = {
+        "responses": job.get("responses", {}),
+        "mode": job.get("mode"),
+        "org_context": job.get("org_context", {}),
+        "use_ai_polish": use_ai_polish,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _merge_polished(rule_findings: list[dict], polished) -> list[dict]:
+    """
+    Overlays the polished findings on the rule findings, as pipeline._polish_chunk
+    does. Raises ValueError when the model dropped or merged findings or broke a
+    required key, so a bad response is retried rather than checkpointed.
+    """
+    if not isinstance(polished, list) or len(polished) != len(rule_findings):
+        raise ValueError(f"polish returned {len(polished) if isinstance(polished, list) else type(polished).__name__}"
+                         f" findings for {len(rule_findings)}")
+    if not all(isinstance(new, dict) for new in polished):
+        raise ValueError("polish returned a finding that is not an object")
+    merged = [{**orig, **new} for orig, new in zip(rule_findings, polished)]
+    for f in merged:
+        missing = [k for k in REQUIRED_FINDING_KEYS if f.get(k) in (None, "")]
+        if missing or isinstance(f["score"], bool) or not isinstance(f["score"], (int, float)):
+            raise ValueError(f"polished finding {f.get('id')} is missing or has invalid {missing or ['score']}")
+    return merged
+
+
+def _load_checkpoint(path: str, digest: str) -> list[dict] | None:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as fh:
+            checkpoint = json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(checkpoint, dict) or checkpoint.get("digest") != digest:
+        return None
+    return checkpoint.get("findings")
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def read_journal(out_dir: str) -> dict:
+    """
+    Returns org_id -> latest journal entry. A torn last line (crash mid-write) is ignored.
+    """
+    path = os.path.join(out_dir, JOURNAL_NAME)
+    latest = {}
+    if not os.path.exists(path):
+        return latest
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            latest[entry["org_id"]] = entry
+    return latest
+
+
+def iter_jobs(jobs_path: str):
+    with open(jobs_path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def process_org(job: dict, out_dir: str, use_ai_polish: bool, retries: int, backoff: float) -> dict:
+    """
+    Runs in a worker process. Writes the PDF (and the findings checkpoint) to
+    out_dir and returns only a small status dict to the parent.
+    """
+    from risk_engine import ai_polish_findings, build_rule_findings, compute_compliance_scores, summarize_findings
+    from pdf_export import build_hipaa_pdf
+
+    org_id = job["org_id"]
+    name = _file_key(org_id)
+    digest = _inputs_digest(job, use_ai_polish)
+    questions = questions_full if job.get("mode") == "full" else questions_core
+    org_context = job.get("org_context", {})
+    responses = job.get("responses", {})
+    findings_path = os.path.join(out_dir, f"{name}.findings.json")
+
+    findings = _load_checkpoint(findings_path, digest)
+    if findings is None:
+        findings = build_rule_findings(questions, responses)
+        if use_ai_polish and findings:
+            for attempt in range(retries + 1):
+                try:
+                    findings = _merge_polished(findings, ai_polish_findings(org_context, findings))
+                    break
+                except Exception:
+                    if attempt == retries:
+                        raise
+                    time.sleep(backoff * 2 ** attempt)
+        _write_atomic(findings_path, json.dumps({"digest": digest, "findings": findings}).encode("utf-8"))
+
+    score_breakdown = compute_compliance_scores(questions, responses)
+    summary, overall_level = summarize_findings(findings, score_breakdown)
+    pdf_path = os.path.join(out_dir, f"HIPAA_Self_Risk_Assessment_{name}.pdf")
+    _write_atomic(pdf_path, build_hipaa_pdf(org_context, summary, overall_level, findings))
+
+    return {
+        "overall_level": overall_level,
+        "compliance": score_breakdown.get("Overall", 0.0),
+        "findings": len(findings),
+        "output": os.path.basename(pdf_path),
+    }
+
+
+def run_batch(jobs_path: str, out_dir: str, workers: int | None = None, use_ai_polish: bool = True,
+              max_attempts: int = 3, retries: int = 2, backoff: float = 2.0, max_in_flight: int | None = None) -> dict:
+    """
+    Processes every job not yet marked done. Jobs are streamed from disk and at
+    most max_in_flight (default 2 x workers) are submitted at once, so memory
+    stays bounded regardless of portfolio size. An org that has failed
+    max_attempts times across runs is left alone until its journal entry is cleared.
+    Repeated org_ids in the jobs file are not run; only the first line counts.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    latest = read_journal(out_dir)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+    counts = {"done": 0, "failed": 0, "skipped": 0, "duplicate": 0}
+    seen = set()
+
+    journal = open(os.path.join(out_dir, JOURNAL_NAME), "a", encoding="utf-8")
+
+    def record(org_id: str, status: str, attempt: int, **extra):
+        entry = {
+            "org_id": org_id,
+            "status": status,
+            "attempt": attempt,
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            **extra,
+        }
+        journal.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        journal.flush()
+        os.fsync(journal.fileno())
+        counts[status] += 1
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = {}
+
+            def drain(return_when):
+                done, _ = wait(in_flight, return_when=return_when)
+                for fut in done:
+                    org_id, attempt = in_flight.pop(fut)
+                    try:
+                        record(org_id, "done", attempt, **fut.result())
+                    except Exception as exc:
+                        record(org_id, "failed", attempt, error=f"{type(exc).__name__}: {exc}")
+
+            for job in iter_jobs(jobs_path):
+                org_id = job["org_id"]
+                if org_id in seen:
+                    # Two jobs for one org would race on the same output files.
+                    counts["duplicate"] += 1
+                    continue
+                seen.add(org_id)
+                prev = latest.get(org_id)
+                if prev and (prev["status"] == "done" or prev.get("attempt", 0) >= max_attempts):
+                    counts["skipped"] += 1
+                    continue
+                attempt = (prev or {}).get("attempt", 0) + 1
+                fut = pool.submit(process_org, job, out_dir, use_ai_polish, retries, backoff)
+                in_flight[fut] = (org_id, attempt)
+                if len(in_flight) >= max_in_flight:
+                    drain(FIRST_COMPLETED)
+
+            if in_flight:
+                drain(ALL_COMPLETED)
+    finally:
+        journal.close()
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable batch HIPAA report runs.")
+    parser.add_argument("jobs", help="JSON-lines file, one org per line")
+    parser.add_argument("--out", required=True, help="output directory (PDFs + journal)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-polish", action="store_true")
+    parser.add_argument("--max-attempts", type=int, default=3)
+    args = parser.parse_args()
+
+    counts = run_batch(
+        args.jobs, args.out, workers=args.workers,
+        use_ai_polish=not args.no_polish, max_attempts=args.max_attempts,
+    )
+    print(
+        f"done: {counts['done']}  failed: {counts['failed']}  skipped: {counts['skipped']}"
+        f"  duplicate org_id rejected: {counts['duplicate']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
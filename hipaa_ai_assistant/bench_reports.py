@@ -0,0 +1,59 @@
+# bench_reports.py
+# Compares render time and output size for each report format.
+# Usage: python bench_reports.py [--runs N] [--mode core|full]
+
+import argparse
+import time
+
+from hipaa_questions import questions_core, questions_full
+from risk_engine import generate_risk_report
+from report_model import build_report_model
+from report_formats import RENDERERS
+from pdf_export import render_pdf
+
+
+def sample_report(questions: list[dict]) -> dict:
+    # A mix of No / Unsure / Yes answers gives a realistic spread of findings.
+    responses = {
+        q["id"]: ("No" if i % 2 == 0 else "Unsure" if i % 3 == 0 else "Yes")
+        for i, q in enumerate(questions)
+    }
+    org_context = {
+        "organization": "Benchmark Clinic",
+        "type": "Clinic (20–150)",
+        "employees": "50-100",
+        "uses_msp": "Yes",
+    }
+    summary, findings, overall_level, score_breakdown = generate_risk_report(
+        org_context, questions, responses, use_ai_polish=False
+    )
+    return build_report_model(org_context, summary, overall_level, findings, score_breakdown)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark report renderers.")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--mode", choices=["core", "full"], default="full")
+    args = parser.parse_args()
+
+    questions = questions_core if args.mode == "core" else questions_full
+
+    start = time.perf_counter()
+    model = sample_report(questions)
+    model_ms = (time.perf_counter() - start) * 1000
+
+    renderers = {"pdf": render_pdf}
+    renderers.update({fmt: r[0] for fmt, r in RENDERERS.items()})
+
+    print(f"{len(model['findings'])} findings, model built in {model_ms:.2f} ms")
+    print(f"{'format':<10}{'ms/render':>12}{'bytes':>12}")
+    for fmt, renderer in renderers.items():
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            out = renderer(model)
+        ms = (time.perf_counter() - start) * 1000 / args.runs
+        print(f"{fmt:<10}{ms:>12.2f}{len(out):>12}")
+
+
+if __name__ == "__main__":
+    main()
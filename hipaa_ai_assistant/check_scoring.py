@@ -0,0 +1,242 @@
+# check_scoring.py
+# Property checks and performance regression gates for risk_engine scoring.
+#
+# Generates random response vectors over questions_core and questions_full and
+# checks scoring invariants, then benchmarks scoring throughput, PDF render time
+# and peak memory per report against a stored baseline.
+#
+# Usage:
+#   python check_scoring.py                   # checks + compare against baseline
+#   python check_scoring.py --update-baseline # record this machine's numbers
+# Exits non-zero on any invariant violation, regression beyond --threshold, or
+# a missing baseline. perf_baseline.json is committed; re-record it with
+# --update-baseline when the machine that runs the gate changes.
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from hipaa_questions import questions_core, questions_full
+from risk_engine import (
+    ANSWER_FACTOR,
+    build_rule_findings,
+    compute_compliance_scores,
+    score_to_level,
+    summarize_findings,
+)
+from pdf_export import build_hipaa_pdf
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baseline.json")
+ANSWERS = ["Yes", "No", "Unsure"]
+
+# metric -> True when higher is better
+METRICS = {
+    "scoring_reports_per_sec": True,
+    "pdf_ms_per_report": False,
+    "peak_kib_per_report": False,
+}
+
+
+def random_responses(rng: random.Random, questions: list[dict]) -> dict:
+    responses = {}
+    for q in questions:
+        roll = rng.random()
+        if roll < 0.05:
+            continue  # unanswered -> scored as Unsure
+        if roll < 0.08:
+            responses[q["id"]] = "N/A"  # unexpected value -> factor 0.5, never triggers
+        else:
+            responses[q["id"]] = rng.choice(ANSWERS)
+    return responses
+
+
+# -----------------------------
+# Invariants
+# -----------------------------
+def check_score_to_level(errors: list[str]):
+    levels = [score_to_level(s) for s in range(1, 10)]
+    order = {"Low": 0, "Medium": 1, "High": 2}
+    if any(order[a] > order[b] for a, b in zip(levels, levels[1:])):
+        errors.append(f"score_to_level not monotonic: {levels}")
+    expected = {1: "Low", 3: "Low", 4: "Medium", 6: "Medium", 7: "High", 9: "High"}
+    for score, level in expected.items():
+        if score_to_level(score) != level:
+            errors.append(f"score_to_level({score}) = {score_to_level(score)}, expected {level}")
+
+
+def check_case(questions: list[dict], responses: dict, errors: list[str]):
+    scores = compute_compliance_scores(questions, responses)
+    findings = build_rule_findings(questions, responses)
+
+    for cat, pct in scores.items():
+        if not 0.0 <= pct <= 100.0:
+            errors.append(f"{cat} compliance {pct} outside [0, 100]")
+
+    # Overall must be the weight-averaged categories (each rounded to 0.1).
+    possible = {}
+    for q in questions:
+        cat = q.get("category", "Uncategorized")
+        possible[cat] = possible.get(cat, 0.0) + float(q.get("weight", 1))
+    total = sum(possible.values())
+    if total:
+        combined = sum(scores[cat] * w for cat, w in possible.items()) / total
+        if abs(combined - scores["Overall"]) > 0.1:
+            errors.append(f"Overall {scores['Overall']} inconsistent with categories ({combined:.2f})")
+
+    # Exact recomputation of each category.
+    for cat, w in possible.items():
+        earned = sum(
+            float(q.get("weight", 1)) * ANSWER_FACTOR.get(responses.get(q["id"], "Unsure"), 0.5)
+            for q in questions if q.get("category", "Uncategorized") == cat
+        )
+        if abs(round(earned / w * 100, 1) - scores[cat]) > 1e-9:
+            errors.append(f"{cat} compliance {scores[cat]} != {earned / w * 100:.1f}")
+
+    expected_ids = [q["id"] for q in questions if responses.get(q["id"]) in q.get("trigger_if", [])]
+    found_ids = [f["id"] for f in findings]
+    if found_ids != expected_ids:
+        errors.append(f"findings {found_ids} do not match trigger_if {expected_ids}")
+
+    for f in findings:
+        if f["score"] != f["likelihood"] * f["impact"]:
+            errors.append(f"{f['id']} score {f['score']} != likelihood x impact")
+        if f["risk_level"] != score_to_level(f["score"]):
+            errors.append(f"{f['id']} risk_level {f['risk_level']} != score_to_level({f['score']})")
+
+    _, overall_level = summarize_findings(findings, scores)
+    if overall_level != score_to_level(max([f["score"] for f in findings], default=1)):
+        errors.append(f"overall level {overall_level} is not the highest finding's level")
+
+
+def run_invariants(cases: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    errors = []
+    check_score_to_level(errors)
+    for questions in (questions_core, questions_full):
+        check_case(questions, {}, errors)
+        for answer in ANSWERS:
+            check_case(questions, {q["id"]: answer for q in questions}, errors)
+        for _ in range(cases):
+            check_case(questions, random_responses(rng, questions), errors)
+            if len(errors) > 20:
+                return errors
+    return errors
+
+
+# -----------------------------
+# Benchmarks
+# -----------------------------
+def bench_scoring(seed: int, n: int = 2000, repeats: int = 5) -> float:
+    rng = random.Random(seed)
+    vectors = [random_responses(rng, questions_full) for _ in range(n)]
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for responses in vectors:
+            findings = build_rule_findings(questions_full, responses)
+            scores = compute_compliance_scores(questions_full, responses)
+            summarize_findings(findings, scores)
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+def _sample_report():
+    responses = {q["id"]: "No" for q in questions_full}
+    findings = build_rule_findings(questions_full, responses)
+    scores = compute_compliance_scores(questions_full, responses)
+    summary, overall_level = summarize_findings(findings, scores)
+    return summary, overall_level, findings
+
+
+def bench_pdf(repeats: int = 5) -> float:
+    summary, overall_level, findings = _sample_report()
+    build_hipaa_pdf({"organization": "Benchmark"}, summary, overall_level, findings)  # warm-up
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        build_hipaa_pdf({"organization": "Benchmark"}, summary, overall_level, findings)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_memory() -> float:
+    summary, overall_level, findings = _sample_report()
+    build_hipaa_pdf({"organization": "Benchmark"}, summary, overall_level, findings)  # warm caches
+    tracemalloc.start()
+    summary, overall_level, findings = _sample_report()
+    build_hipaa_pdf({"organization": "Benchmark"}, summary, overall_level, findings)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for metric, higher_is_better in METRICS.items():
+        base = baseline.get(metric)
+        if not base:
+            continue
+        change = (results[metric] - base) / base
+        if (higher_is_better and change < -threshold) or (not higher_is_better and change > threshold):
+            regressions.append(f"{metric}: {results[metric]:.1f} vs baseline {base:.1f} ({change:+.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Scoring invariants and performance regression gates.")
+    parser.add_argument("--cases", type=int, default=500, help="random response vectors per question set")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--skip-bench", action="store_true")
+    args = parser.parse_args()
+
+    errors = run_invariants(args.cases, args.seed)
+    if errors:
+        print("Invariant violations:")
+        for err in errors:
+            print(f"  - {err}")
+        return 1
+    print(f"Invariants OK ({args.cases} random cases per question set)")
+
+    if args.skip_bench:
+        return 0
+
+    results = {
+        "scoring_reports_per_sec": bench_scoring(args.seed),
+        "pdf_ms_per_report": bench_pdf(),
+        "peak_kib_per_report": bench_memory(),
+    }
+    for metric, value in results.items():
+        print(f"  {metric:<26}{value:>12.1f}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump({k: round(v, 2) for k, v in results.items()}, fh, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline on the gating machine and commit it.")
+        return 1
+
+    with open(args.baseline, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"Performance regressions beyond {args.threshold:.0%}:")
+        for reg in regressions:
+            print(f"  - {reg}")
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
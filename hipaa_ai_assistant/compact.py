@@ -0,0 +1,299 @@
+# compact.py
+# Compact in-memory and on-disk representation of assessments and findings.
+#
+# Findings repeat long library text (title, citation, recommendation). Here a
+# finding is a question index into questions_full plus only what differs for
+# the org: the answer, likelihood/impact and any polished text. Everything else
+# is rebuilt from hipaa_questions.py on demand. Keys a finding lacks compared
+# to the library default are recorded as removed, so decoding never adds fields.
+#
+# In memory, findings are parallel arrays (question index, answer code,
+# likelihood, impact) on the assessment. Polished or otherwise non-default
+# findings add an entry to a sparse {finding index: overrides} dict.
+#
+# Binary record (zlib-compressed, little-endian):
+#   magic "HRA3" | library digest 8s | mode B | n_answers H
+#   answers (one code per library question)
+#   [mode 2 only: n_questions H | library index H per question]
+#   org_id (H len + utf-8) | org_context (I len + JSON)
+#   n_findings H | q H x n | answer B x n | likelihood B x n | impact B x n
+#   n_extra H | per extra: finding index H, overrides (I len + JSON), removed keys (I len + JSON)
+#
+# Indexes are positions in questions_full, so a record only decodes against the
+# library it was written with; the digest of the ordered question ids enforces that.
+#
+# This is a library-level format for callers that store or ship many
+# assessments; the app's own stores (portfolio.jsonl, batch checkpoints) do not use it.
+
+import hashlib
+import json
+import struct
+import zlib
+from array import array
+
+from hipaa_questions import questions_core, questions_full
+from risk_engine import score_to_level
+
+MAGIC = b"HRA3"
+LIBRARY = questions_full
+INDEX = {q["id"]: i for i, q in enumerate(LIBRARY)}
+LIBRARY_DIGEST = hashlib.sha256("\n".join(q["id"] for q in LIBRARY).encode("utf-8")).digest()[:8]
+
+ANSWERS = ("Yes", "No", "Unsure")
+ANSWER_CODE = {a: i for i, a in enumerate(ANSWERS)}
+UNANSWERED = 255
+UNKNOWN_QUESTION = 0xFFFF
+
+# mode 0 / 1 are the built-in sets; CUSTOM_MODE stores the question indexes explicitly.
+MODES = {0: questions_core, 1: questions_full}
+CUSTOM_MODE = 2
+
+_HEADER = struct.Struct("<4s8sBH")
+
+
+def _default_finding(q: dict, answer: str, likelihood: int, impact: int) -> dict:
+    score = likelihood * impact
+    return {
+        "id": q["id"],
+        "category": q.get("category", "Uncategorized"),
+        "title": q["finding_title"],
+        "citation": q["citation"],
+        "answer": answer,
+        "likelihood": likelihood,
+        "impact": impact,
+        "score": score,
+        "risk_level": score_to_level(score),
+        "recommendation": q["recommendation"],
+        "observation": f"Response was '{answer}' for: {q['question']}",
+    }
+
+
+def _small_int(value) -> int:
+    # Out-of-range or non-numeric ratings are stored as 0 and kept verbatim in overrides.
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return value if 0 <= value <= 255 else 0
+
+
+class CompactAssessment:
+    __slots__ = ("org_id", "org_context", "mode", "answers", "subset",
+                 "q", "answer", "likelihood", "impact", "overrides", "removed")
+
+    def __init__(self, org_id: str, org_context: dict, mode: int, answers: array, subset: array | None = None):
+        self.org_id = org_id
+        self.org_context = org_context
+        self.mode = mode
+        self.answers = answers
+        self.subset = subset  # library indexes, only for CUSTOM_MODE
+
+        # One entry per finding, in report order.
+        self.q = array("H")
+        self.answer = array("B")
+        self.likelihood = array("B")
+        self.impact = array("B")
+        # Sparse, keyed by finding index: only findings that differ from the library default.
+        self.overrides = {}
+        self.removed = {}
+
+    @classmethod
+    def from_report(cls, org_id: str, org_context: dict, questions: list[dict],
+                    responses: dict, findings: list[dict]) -> "CompactAssessment":
+        ids = [q["id"] for q in questions]
+        subset = None
+        if ids == [q["id"] for q in questions_core]:
+            mode = 0
+        elif ids == [q["id"] for q in questions_full]:
+            mode = 1
+        else:
+            unknown = [qid for qid in ids if qid not in INDEX]
+            if unknown:
+                raise ValueError(f"Questions not in the library cannot be encoded: {unknown}")
+            mode = CUSTOM_MODE
+            subset = array("H", [INDEX[qid] for qid in ids])
+        answers = array("B", [UNANSWERED]) * len(LIBRARY)
+        for qid, answer in responses.items():
+            if qid in INDEX and answer in ANSWER_CODE:
+                answers[INDEX[qid]] = ANSWER_CODE[answer]
+        assessment = cls(org_id, dict(org_context), mode, answers, subset)
+        for f in findings:
+            assessment.add_finding(f)
+        return assessment
+
+    def __len__(self):
+        return len(self.q)
+
+    def add_finding(self, f: dict):
+        idx = len(self.q)
+        q = INDEX.get(f.get("id"), UNKNOWN_QUESTION)
+        answer = f.get("answer", "Unsure")
+        code = ANSWER_CODE.get(answer, UNANSWERED)
+        likelihood = _small_int(f.get("likelihood", 2))
+        impact = _small_int(f.get("impact", 2))
+        self.q.append(q)
+        self.answer.append(code)
+        self.likelihood.append(likelihood)
+        self.impact.append(impact)
+
+        if q == UNKNOWN_QUESTION:
+            self.overrides[idx] = dict(f)
+            return
+        default = _default_finding(LIBRARY[q], answer, likelihood, impact)
+        overrides = {k: v for k, v in f.items() if k not in default or default[k] != v}
+        removed = tuple(k for k in default if k not in f)
+        if code == UNANSWERED and "answer" in f:
+            overrides["answer"] = answer
+        if overrides:
+            self.overrides[idx] = overrides
+        if removed:
+            self.removed[idx] = removed
+
+    def finding(self, idx: int) -> dict:
+        q = self.q[idx]
+        overrides = self.overrides.get(idx)
+        if q == UNKNOWN_QUESTION:
+            return dict(overrides or {})
+        code = self.answer[idx]
+        answer = ANSWERS[code] if code != UNANSWERED else (overrides or {}).get("answer")
+        f = _default_finding(LIBRARY[q], answer, self.likelihood[idx], self.impact[idx])
+        if overrides:
+            f.update(overrides)
+        for key in self.removed.get(idx, ()):
+            f.pop(key, None)
+        return f
+
+    def score(self, idx: int):
+        overrides = self.overrides.get(idx)
+        if overrides and "score" in overrides:
+            return overrides["score"]
+        return self.likelihood[idx] * self.impact[idx]
+
+    @property
+    def questions(self) -> list[dict]:
+        if self.mode == CUSTOM_MODE:
+            return [LIBRARY[i] for i in self.subset]
+        return MODES[self.mode]
+
+    def responses(self) -> dict:
+        return {
+            q["id"]: ANSWERS[self.answers[INDEX[q["id"]]]]
+            for q in self.questions
+            if self.answers[INDEX[q["id"]]] != UNANSWERED
+        }
+
+    def finding_dicts(self) -> list[dict]:
+        return [self.finding(i) for i in range(len(self.q))]
+
+
+# -----------------------------
+# Binary encoding
+# -----------------------------
+def _pack_str(fmt: str, data: bytes) -> bytes:
+    return struct.pack(fmt, len(data)) + data
+
+
+def _pack_json(value) -> bytes:
+    return _pack_str("<I", json.dumps(value, separators=(",", ":")).encode("utf-8") if value else b"")
+
+
+def encode(assessment: CompactAssessment, level: int = 6) -> bytes:
+    n = len(assessment.q)
+    parts = [
+        _HEADER.pack(MAGIC, LIBRARY_DIGEST, assessment.mode, len(assessment.answers)),
+        assessment.answers.tobytes(),
+    ]
+    if assessment.mode == CUSTOM_MODE:
+        subset = assessment.subset
+        parts.append(struct.pack(f"<H{len(subset)}H", len(subset), *subset))
+    parts += [
+        _pack_str("<H", assessment.org_id.encode("utf-8")),
+        _pack_str("<I", json.dumps(assessment.org_context, separators=(",", ":")).encode("utf-8")),
+        struct.pack(f"<H{n}H", n, *assessment.q),
+        assessment.answer.tobytes(),
+        assessment.likelihood.tobytes(),
+        assessment.impact.tobytes(),
+    ]
+    extra = sorted(set(assessment.overrides) | set(assessment.removed))
+    parts.append(struct.pack("<H", len(extra)))
+    for idx in extra:
+        parts.append(struct.pack("<H", idx))
+        parts.append(_pack_json(assessment.overrides.get(idx)))
+        parts.append(_pack_json(list(assessment.removed.get(idx, ()))))
+    return zlib.compress(b"".join(parts), level)
+
+
+def decode(data: bytes) -> CompactAssessment:
+    buf = memoryview(zlib.decompress(data))
+    magic, digest, mode, n_answers = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a compact assessment record")
+    if digest != LIBRARY_DIGEST or n_answers != len(LIBRARY):
+        raise ValueError("Record was written against a different question library")
+    pos = _HEADER.size
+
+    def read_array(typecode: str, count: int) -> array:
+        nonlocal pos
+        if typecode == "H":
+            out = array("H", struct.unpack_from(f"<{count}H", buf, pos))
+            pos += 2 * count
+        else:
+            out = array(typecode, buf[pos:pos + count])
+            pos += count
+        return out
+
+    def read_str(fmt: str) -> bytes:
+        nonlocal pos
+        (length,) = struct.unpack_from(fmt, buf, pos)
+        pos += struct.calcsize(fmt)
+        out = bytes(buf[pos:pos + length])
+        pos += length
+        return out
+
+    def read_count() -> int:
+        nonlocal pos
+        (count,) = struct.unpack_from("<H", buf, pos)
+        pos += 2
+        return count
+
+    answers = read_array("B", n_answers)
+    subset = read_array("H", read_count()) if mode == CUSTOM_MODE else None
+    org_id = read_str("<H").decode("utf-8")
+    org_context = json.loads(read_str("<I"))
+    assessment = CompactAssessment(org_id, org_context, mode, answers, subset)
+
+    n_findings = read_count()
+    assessment.q = read_array("H", n_findings)
+    assessment.answer = read_array("B", n_findings)
+    assessment.likelihood = read_array("B", n_findings)
+    assessment.impact = read_array("B", n_findings)
+    for _ in range(read_count()):
+        idx = read_count()
+        raw = read_str("<I")
+        raw_removed = read_str("<I")
+        if raw:
+            assessment.overrides[idx] = json.loads(raw)
+        if raw_removed:
+            assessment.removed[idx] = tuple(json.loads(raw_removed))
+    return assessment
+
+
+def write_assessments(path: str, assessments, level: int = 6):
+    """
+    Appends length-prefixed encoded records to path.
+    """
+    with open(path, "ab") as fh:
+        for a in assessments:
+            record = encode(a, level)
+            fh.write(struct.pack("<I", len(record)))
+            fh.write(record)
+
+
+def read_assessments(path: str):
+    with open(path, "rb") as fh:
+        while True:
+            head = fh.read(4)
+            if len(head) < 4:
+                return
+            (length,) = struct.unpack("<I", head)
+            yield decode(fh.read(length))
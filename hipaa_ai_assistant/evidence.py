@@ -0,0 +1,165 @@
+# evidence.py
+# Evidence attachments (policy PDFs, log-review screenshots, BAA copies) keyed to question ids.
+#
+# Layout under the store root:
+#   chunks/<aa>/<sha256>      fixed-size content chunks, shared across orgs and assessments
+#   manifests/<sha256>.json   file hash -> ordered chunk hashes + size
+#   index.jsonl               append-only: which org/assessment/question references which file
+#
+# Files are hashed by streaming (mmap for files on disk) and never held in memory whole.
+
+import hashlib
+import json
+import mmap
+import os
+from datetime import datetime
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+
+class EvidenceStore:
+    def __init__(self, root: str):
+        self.root = root
+        self._chunk_dir = os.path.join(root, "chunks")
+        self._manifest_dir = os.path.join(root, "manifests")
+        self._index_path = os.path.join(root, "index.jsonl")
+        os.makedirs(self._chunk_dir, exist_ok=True)
+        os.makedirs(self._manifest_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._keys = {self._key(ref): ref for ref in self._index}
+
+    @staticmethod
+    def _key(ref: dict) -> tuple:
+        return ref["org_id"], ref["assessment_id"], ref["question_id"], ref["filename"], ref["sha256"]
+
+    def _load_index(self) -> list[dict]:
+        if not os.path.exists(self._index_path):
+            return []
+        with open(self._index_path, encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+
+    # -----------------------------
+    # Blob storage
+    # -----------------------------
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self._chunk_dir, digest[:2], digest)
+
+    def _manifest_path(self, digest: str) -> str:
+        return os.path.join(self._manifest_dir, f"{digest}.json")
+
+    def _put_chunk(self, data) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        return digest
+
+    def _put_chunks(self, chunks) -> tuple[str, int]:
+        file_hash = hashlib.sha256()
+        chunk_hashes = []
+        size = 0
+        for data in chunks:
+            file_hash.update(data)
+            chunk_hashes.append(self._put_chunk(data))
+            size += len(data)
+
+        digest = file_hash.hexdigest()
+        manifest_path = self._manifest_path(digest)
+        if not os.path.exists(manifest_path):
+            tmp = f"{manifest_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({"size": size, "chunks": chunk_hashes}, fh)
+            os.replace(tmp, manifest_path)
+        return digest, size
+
+    def has_blob(self, digest: str) -> bool:
+        return os.path.exists(self._manifest_path(digest))
+
+    def iter_blob(self, digest: str):
+        """
+        Yields the blob's bytes chunk by chunk.
+        """
+        with open(self._manifest_path(digest), encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        for chunk_digest in manifest["chunks"]:
+            with open(self._chunk_path(chunk_digest), "rb") as fh:
+                yield fh.read()
+
+    def export_blob(self, digest: str, dest_path: str):
+        with open(dest_path, "wb") as out:
+            for data in self.iter_blob(digest):
+                out.write(data)
+
+    # -----------------------------
+    # Evidence references
+    # -----------------------------
+    def _reference(self, org_id: str, assessment_id: str, question_id: str,
+                   filename: str, digest: str, size: int) -> dict:
+        # The blob is shared either way; a new name for the same bytes is still its own reference.
+        existing = self._keys.get((org_id, assessment_id, question_id, filename, digest))
+        if existing is not None:
+            return existing
+
+        ref = {
+            "org_id": org_id,
+            "assessment_id": assessment_id,
+            "question_id": question_id,
+            "filename": filename,
+            "sha256": digest,
+            "size": size,
+            "added": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        }
+        with open(self._index_path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(ref, separators=(",", ":")) + "\n")
+        self._index.append(ref)
+        self._keys[self._key(ref)] = ref
+        return ref
+
+    def add_file(self, org_id: str, assessment_id: str, question_id: str,
+                 path: str, filename: str | None = None) -> dict:
+        """
+        Attaches a file on disk to a question. The file is mmapped and hashed chunk by chunk.
+        """
+        filename = filename or os.path.basename(path)
+        with open(path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                digest, size = self._put_chunks([])
+            else:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    view = memoryview(mm)
+                    try:
+                        digest, size = self._put_chunks(
+                            view[i:i + CHUNK_SIZE] for i in range(0, len(view), CHUNK_SIZE)
+                        )
+                    finally:
+                        view.release()
+        return self._reference(org_id, assessment_id, question_id, filename, digest, size)
+
+    def add_stream(self, org_id: str, assessment_id: str, question_id: str,
+                   fileobj, filename: str) -> dict:
+        """
+        Attaches a file-like object (e.g. a Streamlit upload), read CHUNK_SIZE bytes at a time.
+        """
+        def chunks():
+            while True:
+                data = fileobj.read(CHUNK_SIZE)
+                if not data:
+                    return
+                yield data
+
+        digest, size = self._put_chunks(chunks())
+        return self._reference(org_id, assessment_id, question_id, filename, digest, size)
+
+    def evidence_for(self, org_id: str, assessment_id: str | None = None) -> list[dict]:
+        """
+        Evidence references for an org (optionally one assessment), in question-id order.
+        """
+        refs = [
+            ref for ref in self._index
+            if ref["org_id"] == org_id and (assessment_id is None or ref["assessment_id"] == assessment_id)
+        ]
+        return sorted(refs, key=lambda r: (r["question_id"], r["filename"]))
@@ -1,15 +1,25 @@
 from io import BytesIO
-from datetime import datetime
+from xml.sax.saxutils import escape
 from reportlab.lib.pagesizes import LETTER
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 
+from report_model import build_report_model
 
-def build_hipaa_pdf(org_context: dict, summary: str, overall_level: str, findings: list[dict]) -> bytes:
+
+def build_hipaa_pdf(org_context: dict, summary: str, overall_level: str, findings: list[dict],
+                    evidence: list[dict] | None = None) -> bytes:
     """
     Returns a PDF as bytes.
     """
+    return render_pdf(build_report_model(org_context, summary, overall_level, findings, evidence=evidence))
+
+
+def render_pdf(model: dict) -> bytes:
+    """
+    Renders a report model (see report_model.py) to PDF bytes.
+    """
     buffer = BytesIO()
     doc = SimpleDocTemplate(
         buffer,
@@ -25,23 +35,10 @@ def build_hipaa_pdf(org_context: dict, summary: str, overall_level: str, finding
     story = []
 
     # Header
-    story.append(Paragraph("Complisstant HIPAA Security Risk Assessment", styles["Title"]))
+    story.append(Paragraph(model["title"], styles["Title"]))
     story.append(Spacer(1, 8))
 
-    org_name = org_context.get("organization") or "N/A"
-    org_type = org_context.get("type") or "N/A"
-    employees = org_context.get("employees") or "N/A"
-    uses_msp = org_context.get("uses_msp") or "N/A"
-    generated = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-    meta_table_data = [
-        ["Organization", org_name],
-        ["Organization Type", org_type],
-        ["Employees", employees],
-        ["Uses MSP", uses_msp],
-        ["Generated", generated],
-        ["Overall Risk Level", overall_level],
-    ]
+    meta_table_data = [[label, value] for label, value in model["meta"]]
 
     meta_table = Table(meta_table_data, colWidths=[160, 360])
     meta_table.setStyle(TableStyle([
@@ -59,9 +56,11 @@ def build_hipaa_pdf(org_context: dict, summary: str, overall_level: str, finding
     # Executive Summary
     story.append(Paragraph("Executive Summary", styles["Heading2"]))
     story.append(Spacer(1, 6))
-    story.append(Paragraph(summary.replace("\n", "<br/>"), styles["BodyText"]))
+    story.append(Paragraph(model["summary"].replace("\n", "<br/>"), styles["BodyText"]))
     story.append(Spacer(1, 14))
 
+    findings = model["findings"]
+
     # Findings Overview Table
     story.append(Paragraph("Findings Overview", styles["Heading2"]))
     story.append(Spacer(1, 6))
@@ -104,8 +103,8 @@ def build_hipaa_pdf(org_context: dict, summary: str, overall_level: str, finding
             likelihood = f.get("likelihood", "N/A")
             impact = f.get("impact", "N/A")
             score = f.get("score", "N/A")
-            observation = f.get("observation", "N/A")
-            recommendation = f.get("recommendation", "N/A")
+            observation = str(f.get("observation", "N/A"))
+            recommendation = str(f.get("recommendation", "N/A"))
 
             story.append(Paragraph(f"{idx}. {title}", styles["Heading3"]))
             story.append(Spacer(1, 6))
@@ -139,6 +138,35 @@ def build_hipaa_pdf(org_context: dict, summary: str, overall_level: str, finding
     else:
         story.append(Paragraph("No detailed findings to display.", styles["BodyText"]))
 
+    # Evidence Appendix (references only; blobs stay in the evidence store)
+    if model["evidence"]:
+        story.append(PageBreak())
+        story.append(Paragraph("Evidence Appendix", styles["Heading2"]))
+        story.append(Spacer(1, 6))
+
+        evidence_data = [["Question", "File", "Size (bytes)", "SHA-256"]]
+        for ref in model["evidence"]:
+            evidence_data.append([
+                ref.get("question_id", "N/A"),
+                Paragraph(escape(str(ref.get("filename", "N/A"))), styles["BodyText"]),
+                str(ref.get("size", "N/A")),
+                ref.get("sha256", "N/A"),
+            ])
+
+        evidence_table = Table(evidence_data, colWidths=[55, 145, 60, 260], repeatRows=1)
+        evidence_table.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+            ("FONTNAME", (3, 1), (3, -1), "Courier"),
+            ("FONTSIZE", (0, 0), (-1, -1), 8),
+            ("FONTSIZE", (3, 1), (3, -1), 6.5),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("PADDING", (0, 0), (-1, -1), 4),
+        ]))
+        story.append(evidence_table)
+
     doc.build(story)
     pdf_bytes = buffer.getvalue()
     buffer.close()
@@ -0,0 +1,184 @@
+# pipeline.py
+# Async end-to-end report pipeline.
+# Rule scoring feeds a draft render straight away while AI polish runs
+# concurrently (one request per category). Each polished chunk that lands
+# triggers a re-render. In batch mode the LLM I/O for one org overlaps the
+# PDF CPU work for another, so wall time tends toward max(LLM, PDF).
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from risk_engine import (
+    ai_polish_findings,
+    build_rule_findings,
+    compute_compliance_scores,
+    summarize_findings,
+)
+from report_model import build_report_model
+from report_formats import RENDERERS
+
+
+def render_report(fmt: str, org_context: dict, summary: str, overall_level: str,
+                  findings: list[dict], score_breakdown: dict, evidence: list[dict] | None = None) -> bytes:
+    """
+    Module-level so it can be shipped to a process pool.
+    """
+    model = build_report_model(org_context, summary, overall_level, findings, score_breakdown, evidence=evidence)
+    if fmt == "pdf":
+        from pdf_export import render_pdf
+        return render_pdf(model)
+    return RENDERERS[fmt][0](model)
+
+
+def _chunk_by_category(findings: list[dict]) -> list[list[int]]:
+    chunks = {}
+    for idx, f in enumerate(findings):
+        chunks.setdefault(f.get("category", "Uncategorized"), []).append(idx)
+    return list(chunks.values())
+
+
+def _categories(questions: list[dict]) -> set:
+    return {q.get("category", "Uncategorized") for q in questions}
+
+
+async def _polish_chunk(org_context: dict, findings: list[dict], indexes: list[int],
+                        polish_executor: Executor | None = None):
+    chunk = [findings[i] for i in indexes]
+    try:
+        polished = await asyncio.get_running_loop().run_in_executor(
+            polish_executor, ai_polish_findings, org_context, chunk
+        )
+    except Exception:
+        # A failed polish call only costs this chunk its polish; keep the rule-based text.
+        return indexes, chunk
+    if not isinstance(polished, list) or len(polished) != len(chunk):
+        # The model dropped or merged findings; keep the rule-based text for this chunk.
+        return indexes, chunk
+    return indexes, [{**orig, **new} for orig, new in zip(chunk, polished)]
+
+
+async def run_report_pipeline(
+    org_context: dict,
+    questions: list[dict],
+    responses: dict,
+    use_ai_polish: bool = True,
+    fmt: str = "pdf",
+    executor: Executor | None = None,
+    render_drafts: bool = True,
+    on_render=None,
+    evidence: list[dict] | None = None,
+    polish_executor: Executor | None = None,
+):
+    """
+    Returns (summary, findings, overall_level, score_breakdown, report_bytes).
+
+    on_render(report_bytes, final) is called after every render, so a UI can
+    show the draft and swap in polished versions as they arrive. With
+    render_drafts=False only the final report is rendered (useful for batch).
+    Polish calls run on polish_executor (the loop's default thread pool if None).
+    """
+    loop = asyncio.get_running_loop()
+
+    findings = build_rule_findings(questions, responses)
+    score_breakdown = compute_compliance_scores(questions, responses)
+
+    async def render(final: bool) -> bytes:
+        snapshot = [dict(f) for f in findings]
+        summary, overall_level = summarize_findings(snapshot, score_breakdown)
+        out = await loop.run_in_executor(
+            executor, render_report, fmt, org_context, summary, overall_level, snapshot, score_breakdown, evidence
+        )
+        if on_render is not None:
+            on_render(out, final)
+        return out
+
+    polish_tasks = []
+    if use_ai_polish and findings:
+        polish_tasks = [
+            asyncio.create_task(_polish_chunk(org_context, findings, idx, polish_executor))
+            for idx in _chunk_by_category(findings)
+        ]
+    background = list(polish_tasks)
+
+    try:
+        if polish_tasks and render_drafts:
+            # Renders are coalesced: chunks landing during a render share the next one.
+            dirty = asyncio.Event()
+            dirty.set()
+            pending = len(polish_tasks)
+
+            async def renderer():
+                while pending:
+                    await dirty.wait()
+                    dirty.clear()
+                    if pending:
+                        await render(final=False)
+
+            render_task = asyncio.create_task(renderer())
+            background.append(render_task)
+            for task in asyncio.as_completed(polish_tasks):
+                indexes, polished = await task
+                for i, f in zip(indexes, polished):
+                    findings[i] = f
+                pending -= 1
+                dirty.set()
+            await render_task
+        else:
+            for task in asyncio.as_completed(polish_tasks):
+                indexes, polished = await task
+                for i, f in zip(indexes, polished):
+                    findings[i] = f
+    finally:
+        # On error (or cancellation) nothing is left running or unawaited.
+        for task in background:
+            if not task.done():
+                task.cancel()
+        if background:
+            await asyncio.gather(*background, return_exceptions=True)
+
+    summary, overall_level = summarize_findings(findings, score_breakdown)
+    report_bytes = await render(final=True)
+    return summary, findings, overall_level, score_breakdown, report_bytes
+
+
+async def run_batch(
+    jobs: list[dict],
+    use_ai_polish: bool = True,
+    fmt: str = "pdf",
+    max_concurrency: int = 8,
+    executor: Executor | None = None,
+):
+    """
+    jobs: [{"org_context": ..., "questions": ..., "responses": ..., "evidence": optional}, ...]
+    Returns results in job order. Up to max_concurrency orgs are in flight,
+    so polish calls for later orgs run while earlier orgs are rendering.
+    An org that fails gets its exception in place of a result; the rest of
+    the batch still completes.
+
+    Polish calls get their own thread pool sized to the fan-out (max_concurrency
+    orgs x one call per category), since the loop's default pool is capped at
+    min(32, cpu + 4) threads and would queue the LLM I/O.
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+    fanout = max((len(_categories(job["questions"])) for job in jobs), default=1)
+    polish_workers = max(1, min(len(jobs), max_concurrency) * fanout) if use_ai_polish else 1
+
+    async def one(job, polish_executor):
+        async with sem:
+            return await run_report_pipeline(
+                job["org_context"], job["questions"], job["responses"],
+                use_ai_polish=use_ai_polish, fmt=fmt, executor=executor, render_drafts=False,
+                evidence=job.get("evidence"), polish_executor=polish_executor,
+            )
+
+    with ThreadPoolExecutor(max_workers=polish_workers, thread_name_prefix="polish") as polish_executor:
+        return await asyncio.gather(*(one(job, polish_executor) for job in jobs), return_exceptions=True)
+
+
+def run_batch_sync(jobs: list[dict], use_ai_polish: bool = True, fmt: str = "pdf",
+                   max_concurrency: int = 8, workers: int | None = None):
+    """
+    Runs run_batch with renders in a process pool of `workers` processes.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return asyncio.run(run_batch(jobs, use_ai_polish, fmt, max_concurrency, executor))
@@ -0,0 +1,199 @@
+# portfolio.py
+# Portfolio analytics over many stored assessments.
+# Assessments are kept one row per org (latest wins) in a columnar pandas frame.
+# Group-by aggregates are maintained incrementally on every add, so the
+# dashboard reads precomputed numbers instead of re-scanning the portfolio.
+
+import json
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+META_COLUMNS = ("org_id", "org_type", "findings", "high", "medium", "low")
+
+
+class Portfolio:
+    def __init__(self):
+        self._rows = {}          # org_id -> assessment row (dict)
+        self._findings = {}      # org_id -> list of (finding id, title, risk_level)
+        self._frame = None
+        self._findings_frame = None
+
+        # Incrementally maintained aggregates
+        self._type_counts = Counter()    # org_type -> orgs assessed
+        self._type_sums = {}             # org_type -> Counter(category -> summed %)
+        self._type_cat_counts = {}       # org_type -> Counter(category -> orgs with that category)
+        self._finding_counts = Counter() # (risk_level, finding id, title) -> orgs
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add_assessment(self, org_id: str, org_context: dict, score_breakdown: dict, findings: list[dict]):
+        """
+        Adds (or replaces) the latest assessment for org_id.
+        """
+        if org_id in self._rows:
+            self._apply(org_id, -1)
+
+        org_type = org_context.get("type") or "Other"
+        levels = Counter(f.get("risk_level") for f in findings)
+        row = {
+            "org_id": org_id,
+            "org_type": org_type,
+            "findings": len(findings),
+            "high": levels.get("High", 0),
+            "medium": levels.get("Medium", 0),
+            "low": levels.get("Low", 0),
+        }
+        for cat, pct in score_breakdown.items():
+            row[cat] = float(pct)
+
+        self._rows[org_id] = row
+        self._findings[org_id] = [
+            (f.get("id", "N/A"), f.get("title", "N/A"), f.get("risk_level", "N/A")) for f in findings
+        ]
+        self._apply(org_id, +1)
+
+    def _apply(self, org_id: str, sign: int):
+        row = self._rows[org_id]
+        org_type = row["org_type"]
+        sums = self._type_sums.setdefault(org_type, Counter())
+        cat_counts = self._type_cat_counts.setdefault(org_type, Counter())
+
+        self._type_counts[org_type] += sign
+        for cat in self._categories_of(row):
+            sums[cat] += sign * row[cat]
+            cat_counts[cat] += sign
+        for fid, title, level in self._findings[org_id]:
+            self._finding_counts[(level, fid, title)] += sign
+
+        if sign < 0:
+            del self._rows[org_id]
+            del self._findings[org_id]
+            # Counter keeps zero entries around; drop them so lookups stay clean.
+            self._finding_counts += Counter()
+
+        self._frame = None
+        self._findings_frame = None
+
+    @staticmethod
+    def _categories_of(row: dict) -> list[str]:
+        return [k for k in row if k not in META_COLUMNS]
+
+    # -----------------------------
+    # Columnar views
+    # -----------------------------
+    @property
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            frame = pd.DataFrame.from_records(list(self._rows.values()))
+            if not frame.empty:
+                frame["org_type"] = frame["org_type"].astype("category")
+            self._frame = frame
+        return self._frame
+
+    @property
+    def findings_frame(self) -> pd.DataFrame:
+        if self._findings_frame is None:
+            records = [
+                (org_id, self._rows[org_id]["org_type"], fid, title, level)
+                for org_id, items in self._findings.items()
+                for fid, title, level in items
+            ]
+            frame = pd.DataFrame.from_records(
+                records, columns=["org_id", "org_type", "id", "title", "risk_level"]
+            )
+            for col in ("org_type", "id", "title", "risk_level"):
+                frame[col] = frame[col].astype("category")
+            self._findings_frame = frame
+        return self._findings_frame
+
+    # -----------------------------
+    # Precomputed aggregates
+    # -----------------------------
+    def category_means_by_org_type(self) -> pd.DataFrame:
+        """
+        Mean compliance % per category (columns) for each org type (rows).
+        """
+        data = {}
+        for org_type, count in self._type_counts.items():
+            if count <= 0:
+                continue
+            sums = self._type_sums[org_type]
+            cat_counts = self._type_cat_counts[org_type]
+            data[org_type] = {
+                cat: round(total / cat_counts[cat], 1)
+                for cat, total in sums.items()
+                if cat != "Overall" and cat_counts[cat] > 0
+            }
+        return pd.DataFrame.from_dict(data, orient="index").sort_index()
+
+    def weakest_category_by_org_type(self) -> pd.DataFrame:
+        means = self.category_means_by_org_type()
+        if means.empty:
+            return pd.DataFrame(columns=["org_type", "weakest_category", "mean_pct", "orgs"])
+        return pd.DataFrame({
+            "org_type": means.index,
+            "weakest_category": means.idxmin(axis=1).values,
+            "mean_pct": means.min(axis=1).values,
+            "orgs": [self._type_counts[t] for t in means.index],
+        }).reset_index(drop=True)
+
+    def most_common_findings(self, risk_level: str = "High", n: int = 10) -> pd.DataFrame:
+        total = len(self._rows) or 1
+        rows = [
+            (fid, title, count, round(count / total * 100, 1))
+            for (level, fid, title), count in self._finding_counts.items()
+            if level == risk_level and count > 0
+        ]
+        rows.sort(key=lambda r: (-r[2], r[0]))
+        return pd.DataFrame(rows[:n], columns=["id", "title", "orgs", "pct_of_orgs"])
+
+    def percentiles(self, percentiles=DEFAULT_PERCENTILES) -> pd.DataFrame:
+        """
+        Percentile distribution of compliance % per category across all orgs.
+        """
+        frame = self.frame
+        if frame.empty:
+            return pd.DataFrame()
+        cats = [c for c in frame.columns if c not in META_COLUMNS]
+        values = frame[cats].to_numpy(dtype=float)
+        result = np.nanpercentile(values, percentiles, axis=0)
+        return pd.DataFrame(result.T, index=cats, columns=[f"p{p}" for p in percentiles]).round(1)
+
+
+# -----------------------------
+# Append-only assessment store
+# -----------------------------
+def append_assessment(path: str, org_id: str, org_context: dict, score_breakdown: dict, findings: list[dict]):
+    """
+    Appends one assessment as a JSON line. Only the fields the portfolio needs are kept.
+    """
+    record = {
+        "org_id": org_id,
+        "type": org_context.get("type") or "Other",
+        "scores": score_breakdown,
+        "findings": [
+            {"id": f.get("id"), "title": f.get("title"), "risk_level": f.get("risk_level")} for f in findings
+        ],
+    }
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def load_portfolio(path: str) -> Portfolio:
+    portfolio = Portfolio()
+    if not os.path.exists(path):
+        return portfolio
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            portfolio.add_assessment(
+                record["org_id"], {"type": record.get("type")}, record.get("scores", {}), record.get("findings", [])
+            )
+    return portfolio
@@ -0,0 +1,180 @@
+# remediation.py
+# Remediation plan optimizer on top of risk_engine.
+#
+# For every triggered finding, "fixing" it means the answer becomes "Yes".
+# Each fix is scored by:
+#   risk_reduction   weight x likelihood x impact (the value being maximised)
+#   compliance_gain  change in Overall compliance % (and in its own category)
+#   max_score_delta  change in the highest finding score (drives the overall risk level)
+# Given an effort budget, plan_remediation picks fixes with an exact 0/1 knapsack
+# DP; plan_portfolio shares one budget across many orgs with a greedy pass.
+
+import numpy as np
+
+from risk_engine import ANSWER_FACTOR, build_rule_findings, compute_compliance_scores, score_to_level
+
+# Effort units per fix when no estimate is supplied: confirming/documenting an
+# "Unsure" control is cheaper than implementing a missing one.
+DEFAULT_EFFORT = {"Unsure": 1, "No": 3}
+
+
+def _effort_for(fix_id: str, answer: str, effort: dict | None) -> int:
+    if effort and fix_id in effort:
+        return max(int(effort[fix_id]), 1)
+    return DEFAULT_EFFORT.get(answer, 2)
+
+
+def rank_fixes(questions: list[dict], responses: dict, effort: dict | None = None) -> list[dict]:
+    """
+    Returns one entry per triggered finding, best risk reduction per effort first.
+    """
+    by_id = {q["id"]: q for q in questions}
+    findings = build_rule_findings(questions, responses)
+
+    total_possible = sum(float(q.get("weight", 1)) for q in questions) or 1.0
+    cat_possible = {}
+    for q in questions:
+        cat = q.get("category", "Uncategorized")
+        cat_possible[cat] = cat_possible.get(cat, 0.0) + float(q.get("weight", 1))
+
+    scores = sorted((f["score"] for f in findings), reverse=True)
+    top = scores[0] if scores else 1
+    runner_up = scores[1] if len(scores) > 1 else 1
+    top_is_unique = len(scores) < 2 or scores[0] != scores[1]
+
+    fixes = []
+    for f in findings:
+        q = by_id[f["id"]]
+        weight = float(q.get("weight", 1))
+        gain = weight * (1.0 - ANSWER_FACTOR.get(f["answer"], 0.5))
+        cost = _effort_for(f["id"], f["answer"], effort)
+        risk_reduction = weight * f["score"]
+        max_delta = (runner_up - top) if (f["score"] == top and top_is_unique) else 0
+        fixes.append({
+            "id": f["id"],
+            "title": f["title"],
+            "category": f["category"],
+            "answer": f["answer"],
+            "score": f["score"],
+            "effort": cost,
+            "risk_reduction": risk_reduction,
+            "compliance_gain": round(gain / total_possible * 100, 2),
+            "category_gain": round(gain / cat_possible[f["category"]] * 100, 2),
+            "max_score_delta": max_delta,
+            "ratio": round(risk_reduction / cost, 3),
+        })
+
+    fixes.sort(key=lambda x: (-x["ratio"], -x["compliance_gain"], x["id"]))
+    return fixes
+
+
+def _knapsack(values: np.ndarray, costs: np.ndarray, budget: int) -> list[int]:
+    """
+    Exact 0/1 knapsack; the DP row is updated with array ops over the budget axis.
+    """
+    n = len(values)
+    dp = np.zeros(budget + 1)
+    keep = np.zeros((n, budget + 1), dtype=bool)
+    for i in range(n):
+        c = int(costs[i])
+        if c > budget:
+            continue
+        candidate = dp[:budget + 1 - c] + values[i]
+        take = candidate > dp[c:]
+        keep[i, c:] = take
+        dp[c:] = np.where(take, candidate, dp[c:])
+
+    chosen = []
+    b = budget
+    for i in range(n - 1, -1, -1):
+        if keep[i, b]:
+            chosen.append(i)
+            b -= int(costs[i])
+    return chosen[::-1]
+
+
+def _after_fixes(questions: list[dict], responses: dict, fixed_ids) -> tuple[float, str]:
+    patched = dict(responses)
+    for fid in fixed_ids:
+        patched[fid] = "Yes"
+    overall = compute_compliance_scores(questions, patched).get("Overall", 0.0)
+    remaining = build_rule_findings(questions, patched)
+    return overall, score_to_level(max([f["score"] for f in remaining], default=1))
+
+
+def plan_remediation(questions: list[dict], responses: dict, budget: int, effort: dict | None = None) -> dict:
+    """
+    Picks the set of fixes with the largest total risk reduction whose effort
+    fits the budget. Selected fixes are returned in priority order.
+    """
+    fixes = rank_fixes(questions, responses, effort)
+    values = np.array([f["risk_reduction"] for f in fixes], dtype=float)
+    costs = np.array([f["effort"] for f in fixes], dtype=int)
+    chosen_idx = _knapsack(values, costs, max(int(budget), 0))
+    chosen = [fixes[i] for i in chosen_idx]
+    chosen_set = set(chosen_idx)
+
+    projected_compliance, projected_level = _after_fixes(questions, responses, [f["id"] for f in chosen])
+    return {
+        "budget": budget,
+        "effort_used": sum(f["effort"] for f in chosen),
+        "risk_reduction": sum(f["risk_reduction"] for f in chosen),
+        "selected": chosen,
+        "deferred": [f for i, f in enumerate(fixes) if i not in chosen_set],
+        "projected_compliance": projected_compliance,
+        "projected_level": projected_level,
+    }
+
+
+def plan_portfolio(assessments: list[dict], questions: list[dict], budget: int,
+                   effort: dict | None = None) -> list[dict]:
+    """
+    assessments: [{"org_id": ..., "responses": {...}}, ...]
+    Allocates one shared effort budget across every org's open findings,
+    greedily by risk reduction per effort. Returns the chosen fixes in
+    priority order, each tagged with its org_id.
+    """
+    weights = np.array([float(q.get("weight", 1)) for q in questions])
+    risk = np.array([int(q.get("default_likelihood", 2)) * int(q.get("default_impact", 2)) for q in questions])
+    trig_no = np.array(["No" in q.get("trigger_if", []) for q in questions])
+    trig_unsure = np.array(["Unsure" in q.get("trigger_if", []) for q in questions])
+    ids = [q["id"] for q in questions]
+
+    answers = np.array(
+        [[a.get("responses", {}).get(qid, "") for qid in ids] for a in assessments], dtype=object
+    ).reshape(len(assessments), len(ids))
+    is_no = answers == "No"
+    is_unsure = answers == "Unsure"
+    triggered = (is_no & trig_no) | (is_unsure & trig_unsure)
+
+    cost = np.where(is_no, DEFAULT_EFFORT["No"], DEFAULT_EFFORT["Unsure"])
+    if effort:
+        for j, qid in enumerate(ids):
+            if qid in effort:
+                cost[:, j] = max(int(effort[qid]), 1)
+    value = weights * risk
+
+    org_idx, q_idx = np.nonzero(triggered)
+    ratio = value[q_idx] / cost[org_idx, q_idx]
+    order = np.lexsort((q_idx, org_idx, -ratio))
+
+    plan = []
+    remaining = int(budget)
+    for k in order:
+        c = int(cost[org_idx[k], q_idx[k]])
+        if c > remaining:
+            continue
+        remaining -= c
+        q = questions[q_idx[k]]
+        plan.append({
+            "org_id": assessments[org_idx[k]].get("org_id"),
+            "id": q["id"],
+            "title": q["finding_title"],
+            "answer": answers[org_idx[k], q_idx[k]],
+            "effort": c,
+            "risk_reduction": float(value[q_idx[k]]),
+            "ratio": round(float(ratio[k]), 3),
+        })
+        if remaining == 0:
+            break
+    return plan
@@ -0,0 +1,183 @@
+# report_formats.py
+# Lightweight renderers for the shared report model (see report_model.py).
+# Each renderer takes the model and returns bytes, same as build_hipaa_pdf.
+
+import json
+import re
+from html import escape
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+
+def render_json(model: dict) -> bytes:
+    payload = {
+        "title": model["title"],
+        "meta": dict(model["meta"]),
+        "summary": model["summary"],
+        "overall_level": model["overall_level"],
+        "score_breakdown": model["score_breakdown"],
+        "findings": model["findings"],
+        "evidence": model["evidence"],
+    }
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _md_cell(value) -> str:
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def render_markdown(model: dict) -> bytes:
+    lines = [f"# {model['title']}", ""]
+
+    lines += ["| Field | Value |", "| --- | --- |"]
+    for label, value in model["meta"]:
+        lines.append(f"| {label} | {_md_cell(value)} |")
+    lines.append("")
+
+    lines += ["## Executive Summary", "", model["summary"], ""]
+
+    if model["score_breakdown"]:
+        lines += ["## Compliance by Category", "", "| Category | Score |", "| --- | --- |"]
+        for cat, pct in model["score_breakdown"].items():
+            lines.append(f"| {cat} | {pct}% |")
+        lines.append("")
+
+    lines += ["## Findings Overview", ""]
+    findings = model["findings"]
+    if findings:
+        lines += ["| Risk | Finding Title | HIPAA Citation | Score |", "| --- | --- | --- | --- |"]
+        for f in findings:
+            lines.append(
+                f"| {f['risk_level']} | {_md_cell(f['title'])} | {f['citation']} | {f['score']} |"
+            )
+    else:
+        lines.append("No findings were triggered based on responses.")
+    lines.append("")
+
+    lines += ["## Detailed Findings", ""]
+    if findings:
+        for idx, f in enumerate(findings, start=1):
+            lines += [
+                f"### {idx}. {f['title']}",
+                "",
+                f"- **HIPAA Citation:** {f['citation']}",
+                f"- **Risk Level:** {f['risk_level']}",
+                f"- **Likelihood:** {f['likelihood']}",
+                f"- **Impact:** {f['impact']}",
+                f"- **Score:** {f['score']}",
+                "",
+                "**Observation**",
+                "",
+                str(f["observation"]),
+                "",
+                "**Recommendation**",
+                "",
+                str(f["recommendation"]),
+                "",
+            ]
+    else:
+        lines += ["No detailed findings to display.", ""]
+
+    if model["evidence"]:
+        lines += ["## Evidence Appendix", "", "| Question | File | Size (bytes) | SHA-256 |", "| --- | --- | --- | --- |"]
+        for ref in model["evidence"]:
+            lines.append(
+                f"| {ref['question_id']} | {_md_cell(ref['filename'])} | {ref['size']} | `{ref['sha256']}` |"
+            )
+        lines.append("")
+
+    return "\n".join(lines).encode("utf-8")
+
+
+def _html_text(value) -> str:
+    text = escape(str(value))
+    text = _BOLD.sub(r"<b>\1</b>", text)
+    return text.replace("\n", "<br/>")
+
+
+_HTML_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; font-size: 14px; color: #111; max-width: 900px; margin: 32px auto; }
+table { border-collapse: collapse; width: 100%; margin: 8px 0 16px; }
+th, td { border: 1px solid #999; padding: 6px; text-align: left; vertical-align: top; }
+th { background: #ddd; }
+td.label { background: #f5f5f5; width: 160px; }
+.risk-High { color: #B91C1C; font-weight: bold; }
+.risk-Medium { color: #B45309; font-weight: bold; }
+.risk-Low { color: #15803D; font-weight: bold; }
+"""
+
+
+def render_html(model: dict) -> bytes:
+    title = escape(model["title"])
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">",
+        f"<title>{title}</title><style>{_HTML_STYLE}</style></head><body>",
+        f"<h1>{title}</h1>",
+        "<table>",
+    ]
+    for label, value in model["meta"]:
+        parts.append(f"<tr><td class=\"label\">{escape(label)}</td><td>{escape(str(value))}</td></tr>")
+    parts.append("</table>")
+
+    parts += ["<h2>Executive Summary</h2>", f"<p>{_html_text(model['summary'])}</p>"]
+
+    if model["score_breakdown"]:
+        parts += ["<h2>Compliance by Category</h2>", "<table><tr><th>Category</th><th>Score</th></tr>"]
+        for cat, pct in model["score_breakdown"].items():
+            parts.append(f"<tr><td>{escape(cat)}</td><td>{pct}%</td></tr>")
+        parts.append("</table>")
+
+    findings = model["findings"]
+    parts.append("<h2>Findings Overview</h2>")
+    if findings:
+        parts.append("<table><tr><th>Risk</th><th>Finding Title</th><th>HIPAA Citation</th><th>Score</th></tr>")
+        for f in findings:
+            level = escape(str(f["risk_level"]))
+            parts.append(
+                f"<tr><td class=\"risk-{level}\">{level}</td><td>{escape(str(f['title']))}</td>"
+                f"<td>{escape(str(f['citation']))}</td><td>{f['score']}</td></tr>"
+            )
+        parts.append("</table>")
+    else:
+        parts.append("<p>No findings were triggered based on responses.</p>")
+
+    parts.append("<h2>Detailed Findings</h2>")
+    if findings:
+        for idx, f in enumerate(findings, start=1):
+            parts += [
+                f"<h3>{idx}. {escape(str(f['title']))}</h3>",
+                "<table>",
+                f"<tr><td class=\"label\">HIPAA Citation</td><td>{escape(str(f['citation']))}</td></tr>",
+                f"<tr><td class=\"label\">Risk Level</td><td>{escape(str(f['risk_level']))}</td></tr>",
+                f"<tr><td class=\"label\">Likelihood</td><td>{f['likelihood']}</td></tr>",
+                f"<tr><td class=\"label\">Impact</td><td>{f['impact']}</td></tr>",
+                f"<tr><td class=\"label\">Score</td><td>{f['score']}</td></tr>",
+                "</table>",
+                f"<p><b>Observation</b><br/>{_html_text(f['observation'])}</p>",
+                f"<p><b>Recommendation</b><br/>{_html_text(f['recommendation'])}</p>",
+            ]
+    else:
+        parts.append("<p>No detailed findings to display.</p>")
+
+    if model["evidence"]:
+        parts += [
+            "<h2>Evidence Appendix</h2>",
+            "<table><tr><th>Question</th><th>File</th><th>Size (bytes)</th><th>SHA-256</th></tr>",
+        ]
+        for ref in model["evidence"]:
+            parts.append(
+                f"<tr><td>{escape(str(ref['question_id']))}</td><td>{escape(str(ref['filename']))}</td>"
+                f"<td>{ref['size']}</td><td><code>{escape(str(ref['sha256']))}</code></td></tr>"
+            )
+        parts.append("</table>")
+
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+# format -> (renderer, mime type, file extension)
+RENDERERS = {
+    "json": (render_json, "application/json", "json"),
+    "markdown": (render_markdown, "text/markdown", "md"),
+    "html": (render_html, "text/html", "html"),
+}
@@ -0,0 +1,67 @@
+# report_model.py
+# Format-agnostic report model shared by every exporter (PDF, HTML, Markdown, JSON).
+# Built once from generate_risk_report output, then handed to any renderer.
+
+from datetime import datetime
+
+REPORT_TITLE = "Complisstant HIPAA Security Risk Assessment"
+
+FINDING_FIELDS = (
+    "id",
+    "category",
+    "title",
+    "citation",
+    "answer",
+    "likelihood",
+    "impact",
+    "score",
+    "risk_level",
+    "observation",
+    "recommendation",
+)
+
+
+def _normalize_finding(f: dict) -> dict:
+    out = {}
+    for key in FINDING_FIELDS:
+        value = f.get(key)
+        out[key] = "N/A" if value is None or value == "" else value
+    return out
+
+
+def build_report_model(
+    org_context: dict,
+    summary: str,
+    overall_level: str,
+    findings: list[dict],
+    score_breakdown: dict | None = None,
+    generated: str | None = None,
+    evidence: list[dict] | None = None,
+) -> dict:
+    """
+    Returns a plain dict describing the report. Renderers only read from it,
+    so one model can be rendered to several formats without rebuilding.
+    """
+    meta = [
+        ("Organization", org_context.get("organization") or "N/A"),
+        ("Organization Type", org_context.get("type") or "N/A"),
+        ("Employees", org_context.get("employees") or "N/A"),
+        ("Uses MSP", org_context.get("uses_msp") or "N/A"),
+        ("Generated", generated or datetime.now().strftime("%Y-%m-%d %H:%M")),
+        ("Overall Risk Level", overall_level),
+    ]
+
+    return {
+        "title": REPORT_TITLE,
+        "organization": org_context.get("organization") or "N/A",
+        "meta": meta,
+        "summary": summary,
+        "overall_level": overall_level,
+        "score_breakdown": dict(score_breakdown or {}),
+        "findings": [_normalize_finding(f) for f in findings],
+        # Evidence references only (see evidence.py); blobs are never loaded here.
+        "evidence": [
+            {k: ref.get(k) for k in ("question_id", "filename", "size", "sha256")}
+            for ref in evidence or []
+        ],
+    }
@@ -3,7 +3,14 @@ import os
 from dotenv import load_dotenv
 
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+_client = None
+
+def get_client() -> OpenAI:
+    # Created on first use so rule-only scoring and exports work without an API key.
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
 
 ANSWER_FACTOR = {
     "Yes": 1.0,
@@ -61,7 +68,7 @@ Findings:
 
 Return JSON in the format: {{"findings":[...]}} with the same keys for each finding.
 """
-    resp = client.chat.completions.create(
+    resp = get_client().chat.completions.create(
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "You write audit-ready HIPAA risk assessment findings."},
@@ -105,16 +112,9 @@ def compute_compliance_scores(questions, responses):
 
     return percentages
 
-def generate_risk_report(org_context: dict, questions: list[dict], responses: dict, use_ai_polish: bool = True):
-    findings = build_rule_findings(questions, responses)
-
-    if use_ai_polish and findings:
-        findings = ai_polish_findings(org_context, findings)
-
+def summarize_findings(findings: list[dict], score_breakdown: dict):
     overall_score = max([f["score"] for f in findings], default=1)
     overall_level = score_to_level(overall_score)
-
-    score_breakdown = compute_compliance_scores(questions, responses)
     overall_compliance = score_breakdown.get("Overall", 0.0)
 
     summary = (
@@ -122,5 +122,15 @@ def generate_risk_report(org_context: dict, questions: list[dict], responses: di
         f"**Overall Risk Level:** {overall_level} (highest finding score: {overall_score})\n\n"
         f"**Total Findings Identified:** {len(findings)}"
     )
+    return summary, overall_level
+
+def generate_risk_report(org_context: dict, questions: list[dict], responses: dict, use_ai_polish: bool = True):
+    findings = build_rule_findings(questions, responses)
+
+    if use_ai_polish and findings:
+        findings = ai_polish_findings(org_context, findings)
+
+    score_breakdown = compute_compliance_scores(questions, responses)
+    summary, overall_level = summarize_findings(findings, score_breakdown)
 
     return summary, findings, overall_level, score_breakdown
\ No newline at end of file
@@ -0,0 +1,130 @@
+# simulation.py
+# Monte Carlo risk simulation for "Unsure" answers.
+#
+# compute_compliance_scores scores "Unsure" as a flat 0.5 and build_rule_findings
+# uses fixed default_likelihood x default_impact. Here each Unsure answer is
+# sampled as Yes/No per trial, and every triggered finding samples its
+# likelihood and impact around the question defaults. All trials run as NumPy
+# array operations in fixed-size blocks, so 100k trials stay well under a second.
+
+import numpy as np
+
+from risk_engine import score_to_level
+
+LEVELS = ("Low", "Medium", "High")
+BLOCK_SIZE = 25_000
+
+# Offsets applied to default_likelihood / default_impact, clipped to 1..3.
+# Drawn uniformly from this table: -1 / 0 / +1 with probability 0.2 / 0.6 / 0.2.
+RATING_OFFSETS = np.array([-1, -1, 0, 0, 0, 0, 0, 0, 1, 1], dtype=np.int8)
+
+# score (1..9) -> index into LEVELS
+_LEVEL_INDEX = np.array([0] + [LEVELS.index(score_to_level(s)) for s in range(1, 10)], dtype=np.int8)
+
+
+def _interval(values: np.ndarray, ci: float) -> dict:
+    tail = (1 - ci) / 2 * 100
+    low, high = np.percentile(values, [tail, 100 - tail])
+    return {
+        "mean": round(float(values.mean()), 1),
+        "low": round(float(low), 1),
+        "high": round(float(high), 1),
+    }
+
+
+def simulate_assessment(
+    questions: list[dict],
+    responses: dict,
+    trials: int = 100_000,
+    unsure_yes_prob: float = 0.5,
+    ci: float = 0.9,
+    seed: int | None = None,
+) -> dict:
+    """
+    Returns confidence intervals for each category's compliance %, the
+    distribution of the highest finding score and the probability of each
+    overall risk level. Missing or unrecognised answers are treated as Unsure,
+    matching compute_compliance_scores.
+    """
+    if trials < 1:
+        raise ValueError(f"trials must be at least 1, got {trials}")
+    if not questions:
+        raise ValueError("simulate_assessment needs at least one question")
+
+    rng = np.random.default_rng(seed)
+    n = len(questions)
+
+    categories = list(dict.fromkeys(q.get("category", "Uncategorized") for q in questions))
+    cat_index = np.array([categories.index(q.get("category", "Uncategorized")) for q in questions])
+    weights = np.array([float(q.get("weight", 1)) for q in questions])
+    onehot = np.zeros((n, len(categories)))
+    onehot[np.arange(n), cat_index] = weights
+    possible = onehot.sum(axis=0)
+
+    answers = [responses.get(q["id"], "Unsure") for q in questions]
+    answers = [a if a in ("Yes", "No") else "Unsure" for a in answers]
+    is_yes = np.array([a == "Yes" for a in answers])
+    unsure = np.flatnonzero([a == "Unsure" for a in answers])
+
+    # Triggering: fixed for Yes/No answers, per-trial for Unsure (sampled as Yes or No).
+    trig_yes = np.array(["Yes" in q.get("trigger_if", []) for q in questions])
+    trig_no = np.array(["No" in q.get("trigger_if", []) for q in questions])
+    fixed_trigger = np.where(is_yes, trig_yes, trig_no)
+    fixed_trigger[unsure] = False
+    candidates = np.flatnonzero(fixed_trigger | (np.isin(np.arange(n), unsure) & (trig_yes | trig_no)))
+
+    base_like = np.array([int(questions[i].get("default_likelihood", 2)) for i in candidates], dtype=np.int8)
+    base_imp = np.array([int(questions[i].get("default_impact", 2)) for i in candidates], dtype=np.int8)
+    # Position of each candidate within the Unsure columns (-1 when answered Yes/No).
+    unsure_pos = {q: k for k, q in enumerate(unsure)}
+    cand_unsure = np.array([unsure_pos.get(i, -1) for i in candidates], dtype=np.intp)
+    cand_fixed = fixed_trigger[candidates]
+    cand_trig_yes = trig_yes[candidates]
+    cand_trig_no = trig_no[candidates]
+
+    base_earned = is_yes.astype(float) @ onehot
+    unsure_weights = onehot[unsure]
+
+    compliance = np.empty((trials, len(categories) + 1))
+    max_score = np.empty(trials, dtype=np.int8)
+
+    for start in range(0, trials, BLOCK_SIZE):
+        size = min(BLOCK_SIZE, trials - start)
+        block = slice(start, start + size)
+
+        sampled_yes = rng.random((size, len(unsure))) < unsure_yes_prob
+        earned = base_earned + sampled_yes @ unsure_weights
+        compliance[block, :-1] = earned / possible * 100
+        compliance[block, -1] = earned.sum(axis=1) / possible.sum() * 100
+
+        if len(candidates) == 0:
+            max_score[block] = 1
+            continue
+
+        triggered = np.broadcast_to(cand_fixed, (size, len(candidates))).copy()
+        has_unsure = cand_unsure >= 0
+        if has_unsure.any():
+            cand_yes = sampled_yes[:, cand_unsure[has_unsure]]
+            triggered[:, has_unsure] = np.where(cand_yes, cand_trig_yes[has_unsure], cand_trig_no[has_unsure])
+
+        shape = (size, len(candidates))
+        like = np.clip(base_like + RATING_OFFSETS[rng.integers(0, 10, shape, dtype=np.int8)], 1, 3)
+        imp = np.clip(base_imp + RATING_OFFSETS[rng.integers(0, 10, shape, dtype=np.int8)], 1, 3)
+        scores = np.where(triggered, like * imp, 0)
+        max_score[block] = np.maximum(scores.max(axis=1), 1)
+
+    level_counts = np.bincount(_LEVEL_INDEX[max_score], minlength=len(LEVELS))
+    level_probs = {level: round(float(c) / trials, 3) for level, c in zip(LEVELS, level_counts)}
+
+    result = {"Overall": _interval(compliance[:, -1], ci)}
+    for k, cat in enumerate(categories):
+        result[cat] = _interval(compliance[:, k], ci)
+
+    return {
+        "trials": trials,
+        "ci": ci,
+        "compliance": result,
+        "max_score": _interval(max_score.astype(float), ci),
+        "risk_level_probs": level_probs,
+        "overall_level": max(level_probs, key=level_probs.get),
+    }
@@ -0,0 +1,91 @@
+# whatif.py
+# Precomputed what-if explorer: the projected compliance and risk for every
+# single-answer change, computed in one vectorized pass.
+#
+# The question arrays (weights, categories, trigger table, likelihood x impact)
+# are built once per question set in WhatIfModel. project(responses) then
+# returns an (n_questions x 3 answers) table without re-running
+# generate_risk_report or any LLM call.
+
+import numpy as np
+
+from risk_engine import ANSWER_FACTOR, score_to_level
+
+ANSWERS = ("Yes", "No", "Unsure")
+
+
+class WhatIfModel:
+    def __init__(self, questions: list[dict]):
+        self.questions = questions
+        self.ids = [q["id"] for q in questions]
+        self.categories = list(dict.fromkeys(q.get("category", "Uncategorized") for q in questions))
+
+        self.weights = np.array([float(q.get("weight", 1)) for q in questions])
+        self.cat_index = np.array([self.categories.index(q.get("category", "Uncategorized")) for q in questions])
+        self.cat_possible = np.bincount(self.cat_index, weights=self.weights, minlength=len(self.categories))
+        self.total_possible = self.weights.sum() or 1.0
+
+        self.scores = np.array(
+            [int(q.get("default_likelihood", 2)) * int(q.get("default_impact", 2)) for q in questions]
+        )
+        # triggers[i, a]: answering ANSWERS[a] to question i raises a finding
+        self.triggers = np.array([[a in q.get("trigger_if", []) for a in ANSWERS] for q in questions], dtype=bool)
+        self.answer_factors = np.array([ANSWER_FACTOR[a] for a in ANSWERS])
+
+    def project(self, responses: dict) -> dict:
+        """
+        Returns {question id: {answer: projection}} where each projection holds
+        the Overall and category compliance % after that single change, their
+        deltas, the resulting highest finding score / risk level and the change
+        in finding count. Missing answers score as Unsure, as in compute_compliance_scores.
+        """
+        n = len(self.ids)
+        answers = [responses.get(qid) for qid in self.ids]
+        factors = np.array([ANSWER_FACTOR.get(a if a is not None else "Unsure", 0.5) for a in answers])
+        triggered = np.array(
+            [a in q.get("trigger_if", []) for a, q in zip(answers, self.questions)], dtype=bool
+        )
+
+        earned = self.weights * factors
+        cat_earned = np.bincount(self.cat_index, weights=earned, minlength=len(self.categories))
+        overall = earned.sum() / self.total_possible * 100
+        cat_pct = cat_earned / np.where(self.cat_possible, self.cat_possible, 1) * 100
+
+        # (n, 3) change in earned weight for each alternative answer
+        d_earned = self.weights[:, None] * (self.answer_factors[None, :] - factors[:, None])
+        # Same operation order as compute_compliance_scores so rounding matches exactly.
+        overall_new = (earned.sum() + d_earned) / self.total_possible * 100
+        cat_new = (cat_earned[self.cat_index][:, None] + d_earned) / self.cat_possible[self.cat_index][:, None] * 100
+
+        # Highest finding score with question i left out: top-1 unless i is the top, then top-2.
+        live = np.where(triggered, self.scores, 0)
+        if n:
+            order = np.argsort(-live, kind="stable")
+            top1 = live[order[0]]
+            top2 = live[order[1]] if n > 1 else 0
+            excluded = np.where(np.arange(n) == order[0], top2, top1)
+        else:
+            excluded = np.zeros(0, dtype=int)
+        max_new = np.maximum(np.maximum(excluded[:, None], np.where(self.triggers, self.scores[:, None], 0)), 1)
+        findings_delta = self.triggers.astype(int) - triggered.astype(int)[:, None]
+
+        current_max = max(int(live.max(initial=0)), 1)
+        result = {}
+        for i, qid in enumerate(self.ids):
+            cat = self.categories[self.cat_index[i]]
+            per_answer = {}
+            for a, answer in enumerate(ANSWERS):
+                new_max = int(max_new[i, a])
+                per_answer[answer] = {
+                    "overall": round(float(overall_new[i, a]), 1),
+                    "overall_delta": round(float(overall_new[i, a] - overall), 1),
+                    "category": cat,
+                    "category_pct": round(float(cat_new[i, a]), 1),
+                    "category_delta": round(float(cat_new[i, a] - cat_pct[self.cat_index[i]]), 1),
+                    "max_score": new_max,
+                    "max_score_delta": new_max - current_max,
+                    "risk_level": score_to_level(new_max),
+                    "findings_delta": int(findings_delta[i, a]),
+                }
+            result[qid] = per_answer
+        return result